@@ -43,6 +43,19 @@ def parse_db_table_options(db_table_options):
         res.append(parse_db_table(item))
     return res
 
+# Wraps a connection function so that the connection it opens is kept and
+# handed back to later calls, reconnecting only if the cached connection has
+# been closed (e.g. by a connection error).  This lets several consecutive
+# rdb_call_wrapper calls share one connection instead of paying the TCP and
+# auth handshake each time.
+def reusable_conn_fn(conn_fn):
+    cache = [None]
+    def wrapped():
+        if cache[0] is None or not cache[0].is_open():
+            cache[0] = conn_fn()
+        return cache[0]
+    return wrapped
+
 # This function is used to wrap rethinkdb calls to recover from connection errors
 # The first argument to the function is an output parameter indicating if progress
 # has been made since the last call.  This is passed as an array so it works as an
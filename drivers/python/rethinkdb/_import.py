@@ -3,8 +3,8 @@ from __future__ import print_function
 
 import signal
 
-import sys, os, datetime, time, json, traceback, csv
-import multiprocessing, multiprocessing.queues, subprocess, re, ctypes, codecs
+import sys, os, datetime, time, json, traceback, csv, socket
+import multiprocessing, multiprocessing.queues, subprocess, re, ctypes
 from optparse import OptionParser
 from ._backup import *
 import rethinkdb as r
@@ -13,10 +13,37 @@ import rethinkdb as r
 # http://python3porting.com/problems.html
 PY3 = sys.version > '3'
 
+# Prefer a native-code JSON parser when one is installed - decoding dominates
+# the reader processes on large JSON files, and orjson/ujson parse several
+# times faster than the stdlib json module.
 try:
-    import cPickle as pickle
+    import orjson
+    json_loads_fast = orjson.loads
+    def json_dumps_fast(obj):
+        return orjson.dumps(obj).decode("utf-8")
 except ImportError:
-    import pickle
+    try:
+        import ujson
+        json_loads_fast = ujson.loads
+        json_dumps_fast = ujson.dumps
+    except ImportError:
+        json_loads_fast = None
+        json_dumps_fast = None
+
+# The Arrow CSV reader tokenizes in native code and is much faster than the
+# stdlib csv module on large files; use it when it's installed (Python 3 only,
+# since pyarrow itself is).
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:
+    pyarrow = None
+
+# Rows travel through the task queue as JSON text - the data originates as
+# JSON and the wire protocol is JSON, so pickling each row would just add two
+# extra serialization passes.
+row_dumps = json_dumps_fast if json_dumps_fast is not None else json.dumps
+row_loads = json_loads_fast if json_loads_fast is not None else json.loads
 try:
     from itertools import imap
 except ImportError:
@@ -29,6 +56,18 @@ try:
     from multiprocessing import SimpleQueue
 except ImportError:
     from multiprocessing.queues import SimpleQueue
+try:
+    from multiprocessing.connection import wait as wait_for_connections
+except ImportError:
+    wait_for_connections = None
+try:
+    from Queue import Empty as QueueEmpty, Full as QueueFull
+except ImportError:
+    from queue import Empty as QueueEmpty, Full as QueueFull
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None # Python 2 without the futures backport
 
 info = "'rethinkdb import` loads data into a RethinkDB cluster"
 usage = "\
@@ -255,21 +294,31 @@ def parse_options():
 # This is called through rdb_call_wrapper so reattempts can be tried as long as progress
 # is being made, but connection errors occur.  We save a failed task in the progress object
 # so it can be resumed later on a new connection.
-def import_from_queue(progress, conn, task_queue, error_queue, replace_conflicts, durability):
+def import_from_queue(progress, conn, task_queue, error_queue, replace_conflicts, durability, batch_limits):
+    # The db/table prefix of the ReQL term is constant per table, so build it
+    # once instead of reallocating the AST nodes for every batch
+    table_cache = {}
+    def table_term(db, table):
+        try:
+            return table_cache[(db, table)]
+        except KeyError:
+            return table_cache.setdefault((db, table), r.db(db).table(table))
+
     if progress[0] is None:
         progress[0] = 0
-        progress.append(None)
+        progress.append(None) # the task being inserted, for resuming after an error
+        progress.append(None) # a task pulled for fusing but not yet started
     elif not replace_conflicts:
         # We were interrupted and it's not ok to overwrite rows, check that the batch either:
         # a) does not exist on the server
         # b) is exactly the same on the server
         task = progress[1]
-        pkey = r.db(task[0]).table(task[1]).info().run(conn)["primary_key"]
+        pkey = table_term(task[0], task[1]).info().run(conn)["primary_key"]
         for i in reversed(range(len(task[2]))):
-            obj = pickle.loads(task[2][i])
+            obj = row_loads(task[2][i])
             if pkey not in obj:
                 raise RuntimeError("Connection error while importing.  Current row has no specified primary key, so cannot guarantee absence of duplicates")
-            row = r.db(task[0]).table(task[1]).get(obj[pkey]).run(conn)
+            row = table_term(task[0], task[1]).get(obj[pkey]).run(conn)
             if row == obj:
                 progress[0] += 1
                 del task[2][i]
@@ -278,11 +327,40 @@ def import_from_queue(progress, conn, task_queue, error_queue, replace_conflicts
 
     task = task_queue.get() if progress[1] is None else progress[1]
     while len(task) == 3:
+        if not isinstance(task[2], list):
+            # Batches arrive as a single newline-joined JSON blob - one big
+            # string is much cheaper to move through the queue than a list of
+            # small ones.  JSON strings never contain a raw newline.
+            task = (task[0], task[1], task[2].split("\n"))
+
+        # Opportunistically fuse a few more waiting batches for the same
+        # table into one insert to amortize the queue and request round trips
+        fused = 1
+        while fused < max_batch_fuse and progress[2] is None:
+            try:
+                extra = task_queue.get(timeout=0.01)
+            except QueueEmpty:
+                break
+            if len(extra) != 3 or extra[0] != task[0] or extra[1] != task[1]:
+                # An exit marker or a batch for another table - hold it as
+                # our next task rather than requeuing it, since a put on the
+                # bounded queue can block with no one left to drain it.  It
+                # sits in progress so a connection error can't lose it.
+                progress[2] = extra
+                break
+            rows = extra[2].split("\n") if not isinstance(extra[2], list) else extra[2]
+            task = (task[0], task[1], task[2] + rows)
+            fused += 1
+
         try:
-            # Unpickle objects (TODO: super inefficient, would be nice if we could pass down json)
-            objs = [pickle.loads(obj) for obj in task[2]]
+            # The rows are already serialized JSON - wrap them in r.json so
+            # the server parses the batch once instead of the driver walking
+            # every value to rebuild it as a ReQL term
+            batch = r.json("[" + ",".join(task[2]) + "]")
             conflict_action = 'replace' if replace_conflicts else 'error'
-            res = r.db(task[0]).table(task[1]).insert(objs, durability=durability, conflict=conflict_action).run(conn)
+            start_time = time.time()
+            res = table_term(task[0], task[1]).insert(batch, durability=durability, conflict=conflict_action).run(conn)
+            adjust_batch_limits(batch_limits, time.time() - start_time)
         except:
             progress[1] = task
             raise
@@ -291,15 +369,34 @@ def import_from_queue(progress, conn, task_queue, error_queue, replace_conflicts
             raise RuntimeError("Error when importing into table '%s.%s': %s" %
                                (task[0], task[1], res["first_error"]))
 
-        progress[0] += len(objs)
-        task = task_queue.get()
+        progress[0] += len(task[2])
+        if progress[2] is not None:
+            task = progress[2]
+            progress[2] = None
+        else:
+            task = task_queue.get()
     return progress[0]
 
+# Tune the driver connection's socket for bulk transfers - batch writes
+# shouldn't sit waiting on Nagle, and a larger send buffer lets a full batch
+# flush in one go.  Best-effort, since the socket attribute is
+# driver-internal.
+def tune_connection_socket(conn):
+    try:
+        sock = conn.socket
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+    except Exception:
+        pass
+
 # This is run for each client requested, and accepts tasks from the reader processes
-def client_process(host, port, auth_key, task_queue, error_queue, rows_written, replace_conflicts, durability):
+def client_process(host, port, auth_key, task_queue, error_queue, rows_written, replace_conflicts, durability, batch_limits):
     try:
-        conn_fn = lambda: r.connect(host, port, auth_key=auth_key)
-        res = rdb_call_wrapper(conn_fn, "import", import_from_queue, task_queue, error_queue, replace_conflicts, durability)
+        def conn_fn():
+            conn = r.connect(host, port, auth_key=auth_key)
+            tune_connection_socket(conn)
+            return conn
+        res = rdb_call_wrapper(conn_fn, "import", import_from_queue, task_queue, error_queue, replace_conflicts, durability, batch_limits)
         with rows_written.get_lock():
             rows_written.value += res
     except:
@@ -308,50 +405,169 @@ def client_process(host, port, auth_key, task_queue, error_queue, rows_written,
 
 batch_length_limit = 200
 batch_size_limit = 500000
+max_batch_fuse = 4
+
+# The limits above are only starting points - clients grow them while insert
+# latency stays low and shrink them when it spikes, so small documents don't
+# underfill batches and huge documents don't stall the server
+min_batch_length_limit = 10
+max_batch_length_limit = 5000
+min_batch_size_limit = 64 * 1024
+max_batch_size_limit = 8 * 1024 * 1024
+batch_latency_low = 0.05
+batch_latency_high = 0.5
+
+# Set in each reader process - a pair of shared Values holding the current
+# batch length/size limits tuned by the clients
+shared_batch_limits = None
+
+def adjust_batch_limits(batch_limits, insert_time):
+    if insert_time < batch_latency_low:
+        with batch_limits[0].get_lock():
+            batch_limits[0].value = min(max_batch_length_limit, batch_limits[0].value * 5 // 4 + 1)
+        with batch_limits[1].get_lock():
+            batch_limits[1].value = min(max_batch_size_limit, batch_limits[1].value * 5 // 4)
+    elif insert_time > batch_latency_high:
+        with batch_limits[0].get_lock():
+            batch_limits[0].value = max(min_batch_length_limit, batch_limits[0].value * 3 // 4)
+        with batch_limits[1].get_lock():
+            batch_limits[1].value = max(min_batch_size_limit, batch_limits[1].value * 3 // 4)
 
 class InterruptedError(Exception):
     def __str__(self):
         return "Interrupted"
 
+# Put a task on the bounded queue, giving up if the import is aborted - a
+# plain put could block forever once the clients have died and nothing is
+# draining the queue
+def put_task(task_queue, exit_event, task):
+    while True:
+        try:
+            task_queue.put(task, timeout=0.1)
+            return
+        except QueueFull:
+            if exit_event.is_set():
+                raise InterruptedError()
+
 # This function is called for each object read from a file by the reader processes
 #  and will push tasks to the client processes on the task queue
-def object_callback(obj, db, table, task_queue, object_buffers, buffer_sizes, fields, exit_event):
+def object_callback(obj, db, table, task_queue, object_buffers, buffer_total, exit_event, raw_row=None, check_dict=True):
     global batch_size_limit
     global batch_length_limit
 
-    if exit_event.is_set():
-        raise InterruptedError()
-
-    if not isinstance(obj, dict):
+    # The csv readers build the row dicts themselves, so only json input
+    # needs to be checked for non-object records
+    if check_dict and not isinstance(obj, dict):
         raise RuntimeError("Error: Invalid input, expected an object, but got %s" % type(obj))
 
-    # filter out fields
-    if fields is not None:
-        for key in list(obj.keys()):
-            if key not in fields:
-                del obj[key]
-
-    # Pickle the object here because we want an accurate size, and it'll pickle anyway for IPC
-    object_buffers.append(pickle.dumps(obj))
-    buffer_sizes.append(len(object_buffers[-1]))
-    if len(object_buffers) >= batch_length_limit or sum(buffer_sizes) > batch_size_limit:
-        task_queue.put((db, table, object_buffers))
-        del object_buffers[0:len(object_buffers)]
-        del buffer_sizes[0:len(buffer_sizes)]
+    # Buffer the row as JSON text because we want an accurate size, and the
+    # row is JSON at both ends of the pipeline anyway.  JSON readers hand us
+    # the original slice of the file so nothing needs to be re-encoded -
+    # unless the slice contains newlines (pretty-printed input), which would
+    # corrupt the newline-joined batch framing, so those are re-encoded.
+    if raw_row is None or "\n" in raw_row:
+        object_buffers.append(row_dumps(obj))
+    else:
+        object_buffers.append(raw_row)
+    # buffer_total is a single-element list so it can act as an output
+    # parameter - a running total is O(1) per row where summing a list of
+    # sizes at every flush check was O(batch length)
+    buffer_total[0] += len(object_buffers[-1])
+    if len(object_buffers) >= batch_length_limit or buffer_total[0] > batch_size_limit:
+        # Checking the exit event acquires a semaphore, so do it once per
+        # batch rather than once per row - an abort is still noticed within
+        # one batch length
+        if exit_event.is_set():
+            raise InterruptedError()
+        put_task(task_queue, exit_event, (db, table, "\n".join(object_buffers)))
+        # Clear in place (the caller holds a reference to this list)
+        object_buffers[:] = []
+        buffer_total[0] = 0
+        if shared_batch_limits is not None:
+            # Pick up the limits the clients have tuned - only read the
+            # shared values once per flush, not per row
+            batch_length_limit = shared_batch_limits[0].value
+            batch_size_limit = shared_batch_limits[1].value
     return obj
 
+# Build the per-row callback for a reader - the --fields filter is specialized
+# out here so rows only pay for it when it was actually requested
+def make_object_callback(db, table, task_queue, object_buffers, buffer_total, fields, exit_event, check_dict=True):
+    if fields is None:
+        return lambda obj, raw_row=None: object_callback(obj, db, table, task_queue, object_buffers,
+                                                         buffer_total, exit_event, raw_row, check_dict)
+    fields_set = frozenset(fields)
+    # A filtered row no longer matches its original serialization, so the raw
+    # slice is dropped and the filtered object is re-encoded
+    def filtered_callback(obj, raw_row=None):
+        if isinstance(obj, dict):
+            obj = dict((key, value) for (key, value) in obj.items() if key in fields_set)
+        return object_callback(obj, db, table, task_queue, object_buffers,
+                               buffer_total, exit_event, None, check_dict)
+    return filtered_callback
+
 json_read_chunk_size = 32 * 1024
 json_max_buffer_size = 16 * 1024 * 1024
 
+# Bound once at module load - the whitespace scan runs several times per
+# record, and the attribute lookups would otherwise repeat in the hot loop
+json_whitespace_match = json.decoder.WHITESPACE.match
+
+# Matches the separator between array records - a single native regex call
+# replaces a whitespace match plus two Python-level character compares
+json_separator_match = re.compile(r"\s*(?P<sep>[,\]])\s*").match
+
+# Find the end of the JSON value beginning at the given offset by tracking
+# brace depth and string state, so the value can be handed to a native parser
+# in a single call.  Raises a ValueError if the buffer ends mid-value, which
+# the callers treat as a signal to read more data from the file.
+def scan_json_value_end(json_data, offset):
+    depth = 0
+    in_string = False
+    escaped = False
+    pos = offset
+    length = len(json_data)
+    while pos < length:
+        char = json_data[pos]
+        pos += 1
+        if escaped:
+            escaped = False
+        elif in_string:
+            if char == "\\":
+                escaped = True
+            elif char == "\"":
+                in_string = False
+                if depth == 0:
+                    return pos
+        elif char == "\"":
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return pos
+    raise ValueError("Error: Truncated JSON value")
+
+# Decode one JSON value at the given offset, returning (obj, end_offset).
+# Uses the native parser on a scanned slice when available, otherwise falls
+# back to the stdlib decoder's raw_decode.
+def decode_json_value(decoder, json_data, offset):
+    if json_loads_fast is not None and json_data[offset] in "{[\"":
+        end = scan_json_value_end(json_data, offset)
+        return (json_loads_fast(json_data[offset:end]), end)
+    return decoder.raw_decode(json_data, idx=offset)
+
 def read_json_single_object(json_data, file_in, callback):
     decoder = json.JSONDecoder()
     while True:
         try:
-            (obj, offset) = decoder.raw_decode(json_data)
+            offset = json_whitespace_match(json_data, 0).end()
+            (obj, offset) = decode_json_value(decoder, json_data, offset)
             json_data = json_data[offset:]
             callback(obj)
             break
-        except ValueError:
+        except (ValueError, IndexError):
             before_len = len(json_data)
             json_data += file_in.read(json_read_chunk_size)
             if before_len == len(json_data):
@@ -365,34 +581,58 @@ def read_json_array(json_data, file_in, callback, progress_info,
     offset = 0
     while True:
         try:
-            offset = json.decoder.WHITESPACE.match(json_data, offset).end()
+            offset = json_whitespace_match(json_data, offset).end()
 
             if json_array and json_data[offset] == "]":
                 break  # End of JSON
 
-            (obj, offset) = decoder.raw_decode(json_data, idx=offset)
-            callback(obj)
+            record_start = offset
+            (obj, offset) = decode_json_value(decoder, json_data, offset)
+            # Hand the callback the original slice of the file along with the
+            # decoded object, so rows don't have to be re-serialized
+            callback(obj, json_data[record_start:offset])
+
+            # Read past the separator to the next record
+            if json_array:
+                match = json_separator_match(json_data, offset)
+                if match is None:
+                    raise ValueError("Error: JSON format not recognized - expected ',' or ']' after object")
+                if match.group("sep") == "]":
+                    # Leave the closing bracket for the check at the top of the loop
+                    offset = match.start("sep")
+                else:
+                    offset = match.end()
+            else:
+                offset = json_whitespace_match(json_data, offset).end()
 
-            # Read past whitespace to the next record
+        except (ValueError, IndexError):
+            # Discard the parsed prefix only when we need to read more data -
+            # trimming the buffer after every record would copy the entire
+            # tail each time
             file_offset += offset
             json_data = json_data[offset:]
-            offset = json.decoder.WHITESPACE.match(json_data, 0).end()
+            offset = 0
 
-            if json_array and json_data[offset] == ",":
-                # Read past the comma
-                offset = json.decoder.WHITESPACE.match(json_data, offset + 1).end()
-            elif json_array and json_data[offset] != "]":
-                raise ValueError("Error: JSON format not recognized - expected ',' or ']' after object")
-
-        except (ValueError, IndexError):
             before_len = len(json_data)
             json_data += file_in.read(json_read_chunk_size)
-            if json_array and json_data[offset] == ",":
-                offset = json.decoder.WHITESPACE.match(json_data, offset + 1).end()
-            elif (not json_array) and before_len == len(json_data):
-                break  # End of JSON
-            elif before_len == len(json_data) or len(json_data) > json_max_buffer_size:
+            if before_len == len(json_data):
+                if not json_array:
+                    break  # End of JSON
+                raise
+            if len(json_data) > json_max_buffer_size:
                 raise
+            if json_array:
+                # The buffer may have run out in the whitespace between a
+                # record and its separator - consume the separator now that
+                # more data has arrived.  A buffer cut mid-record matches
+                # nothing here, since no JSON value starts with ',' or ']'.
+                match = json_separator_match(json_data, offset)
+                if match is not None:
+                    if match.group("sep") == "]":
+                        # Leave the closing bracket for the check at the top of the loop
+                        offset = match.start("sep")
+                    else:
+                        offset = match.end()
             progress_info[0].value = file_offset
 
     # Read the rest of the file and return it so it can be checked for unexpected data
@@ -401,19 +641,19 @@ def read_json_array(json_data, file_in, callback, progress_info,
 
 def json_reader(task_queue, filename, db, table, fields, progress_info, exit_event):
     object_buffers = []
-    buffer_sizes = []
+    buffer_total = [0]
 
     with open(filename, "r") as file_in:
         # Scan to the first '[', then load objects one-by-one
         # Read in the data in chunks, since the json module would just read the whole thing at once
         json_data = file_in.read(json_read_chunk_size)
 
-        callback = lambda x: object_callback(x, db, table, task_queue, object_buffers,
-                                             buffer_sizes, fields, exit_event)
+        callback = make_object_callback(db, table, task_queue, object_buffers,
+                                        buffer_total, fields, exit_event)
 
         progress_info[1].value = os.path.getsize(filename)
 
-        offset = json.decoder.WHITESPACE.match(json_data, 0).end()
+        offset = json_whitespace_match(json_data, 0).end()
         if json_data[offset] in "[{":
             json_data = read_json_array(
                 json_data[offset + (1 if json_data[offset] == "[" else 0):],
@@ -424,129 +664,244 @@ def json_reader(task_queue, filename, db, table, fields, progress_info, exit_eve
 
         # Make sure only remaining data is whitespace
         while len(json_data) > 0:
-            if json.decoder.WHITESPACE.match(json_data, 0).end() != len(json_data):
+            if json_whitespace_match(json_data, 0).end() != len(json_data):
                 raise RuntimeError("Error: JSON format not recognized - extra characters found after end of data")
             json_data = file_in.read(json_read_chunk_size)
 
     progress_info[0].value = progress_info[1].value
 
     if len(object_buffers) > 0:
-        task_queue.put((db, table, object_buffers))
+        put_task(task_queue, exit_event, (db, table, "\n".join(object_buffers)))
 
-# Wrapper classes for the handling of unicode csv files
-# Taken from https://docs.python.org/2/library/csv.html
-class Utf8Recoder:
-    def __init__(self, f):
-        self.reader = codecs.getreader('utf-8')(f)
+# On Python 2 the csv module parses byte strings, so fields are decoded once
+# after parsing - the old Utf8Recoder/Utf8CsvReader wrappers from the csv docs
+# transcoded every line three times
+def open_csv_file(filename):
+    if PY3:
+        return open(filename, 'r', encoding='utf-8', newline='')
+    else:
+        return open(filename, 'rb')
+
+def decode_csv_row(row):
+    return [unicode(field, 'utf-8') for field in row]
+
+# Determine the field names for a csv file, reading the header row (if any)
+# and applying any custom header from the options
+def csv_header_fields(filename, options):
+    fields_in = None
+    if not options["no_header"]:
+        with open_csv_file(filename) as file_in:
+            fields_in = next(csv.reader(file_in, delimiter=options["delimiter"]))
+            if not PY3:
+                fields_in = decode_csv_row(fields_in)
+
+    # Field names may override fields from the header
+    if options["custom_header"] is not None:
+        if not options["no_header"]:
+            print("Ignoring header row: %s" % str(fields_in))
+        fields_in = options["custom_header"]
+    elif options["no_header"]:
+        raise RuntimeError("Error: No field name information available")
 
-    def __iter__(self):
-        return self
+    return fields_in
 
-    def next(self):
-        return self.reader.next().encode("utf-8")
+# Parse a csv file using the Arrow streaming reader - the tokenizer runs in
+# native code and hands back whole record batches.  All columns are read as
+# strings to match the behavior of the stdlib path.
+def csv_reader_arrow(task_queue, filename, db, table, options, fields_in, progress_info, exit_event):
+    object_buffers = []
+    buffer_total = [0]
+
+    read_options = pyarrow.csv.ReadOptions(column_names=fields_in,
+                                           skip_rows=0 if options["no_header"] else 1)
+    parse_options = pyarrow.csv.ParseOptions(delimiter=options["delimiter"])
+    convert_options = pyarrow.csv.ConvertOptions(
+        column_types=dict((name, pyarrow.string()) for name in fields_in))
+
+    callback = make_object_callback(db, table, task_queue, object_buffers,
+                                    buffer_total, options["fields"], exit_event,
+                                    check_dict=False)
+
+    bytes_read = 0
+    reader = pyarrow.csv.open_csv(filename, read_options=read_options,
+                                  parse_options=parse_options,
+                                  convert_options=convert_options)
+    for batch in reader:
+        for obj in batch.to_pylist():
+            # Treat empty fields as no entry rather than empty string
+            obj = dict((key, value) for (key, value) in obj.items() if value)
+            callback(obj)
+        bytes_read += batch.nbytes
+        progress_info[0].value = min(bytes_read, progress_info[1].value)
 
-class Utf8CsvReader:
-    def __init__(self, f, **kwargs):
-        f = Utf8Recoder(f)
-        self.reader = csv.reader(f, **kwargs)
-        self.line_num = self.reader.line_num
+    progress_info[0].value = progress_info[1].value
 
-    def next(self):
-        row = self.reader.next()
-        self.line_num = self.reader.line_num
-        return [unicode(s, 'utf-8') for s in row]
+    if len(object_buffers) > 0:
+        put_task(task_queue, exit_event, (db, table, "\n".join(object_buffers)))
 
-    def __iter__(self):
-        return self
+# Parse one byte range of a csv file.  A range covers the rows whose line
+# starts after `start` (the partial line at `start` belongs to the previous
+# range) up to and including the row starting at `end`.
+def csv_reader_range(task_queue, filename, db, table, options, fields_in, byte_range, progress_info, exit_event):
+    (start, end) = byte_range
+    object_buffers = []
+    buffer_total = [0]
 
-def open_csv_file(filename):
-    if PY3:
-        return open(filename, 'r', encoding='utf-8', newline='')
-    else:
-        return open(filename, 'r')
+    callback = make_object_callback(db, table, task_queue, object_buffers,
+                                    buffer_total, options["fields"], exit_event,
+                                    check_dict=False)
 
-def csv_reader(task_queue, filename, db, table, options, progress_info, exit_event):
-    object_buffers = []
-    buffer_sizes = []
+    progress_info[1].value = end - start
 
-    # Count the lines so we can report progress
-    # TODO: this requires us to make two passes on csv files
-    line_count = 0
-    with open_csv_file(filename) as file_in:
-        for i, l in enumerate(file_in):
-            pass
-        line_count = i + 1
+    with open(filename, "rb") as file_in:
+        if start == 0:
+            if not options["no_header"]:
+                file_in.readline() # Skip the header row, read by csv_header_fields
+        else:
+            file_in.seek(start)
+            file_in.readline() # Skip the partial line at the range start
+
+        # Feed lines to the csv module one at a time so row boundaries can be
+        # tracked by byte offset - the csv module's own read-ahead would make
+        # the file position useless for deciding where the range ends
+        def range_lines():
+            line_count = 0
+            while file_in.tell() <= end:
+                line = file_in.readline()
+                if len(line) == 0:
+                    break
+                line_count += 1
+                if line_count & 0x3ff == 0:
+                    # Writing a multiprocessing.Value takes its lock, so only
+                    # update the shared counter every 1024 rows
+                    progress_info[0].value = file_in.tell() - start
+                yield line.decode("utf-8")
+
+        for row in csv.reader(range_lines(), delimiter=options["delimiter"]):
+            if len(fields_in) != len(row):
+                raise RuntimeError("Error: File '%s' has an inconsistent number of columns" % filename)
+            # We import all csv fields as strings (since we can't assume the
+            # type of the data), treating empty fields as no entry rather
+            # than empty string
+            callback(dict((key, value) for (key, value) in zip(fields_in, row) if len(value) > 0))
+
+    progress_info[0].value = progress_info[1].value
+
+    if len(object_buffers) > 0:
+        put_task(task_queue, exit_event, (db, table, "\n".join(object_buffers)))
+
+def csv_reader(task_queue, filename, db, table, options, progress_info, exit_event, byte_range=None):
+    fields_in = csv_header_fields(filename, options)
+
+    if byte_range is not None:
+        return csv_reader_range(task_queue, filename, db, table, options,
+                                fields_in, byte_range, progress_info, exit_event)
 
-    progress_info[1].value = line_count
+    # Report progress by file offset so we don't need a line-counting
+    # pass over the file before parsing it
+    progress_info[1].value = os.path.getsize(filename)
+
+    if pyarrow is not None and PY3:
+        return csv_reader_arrow(task_queue, filename, db, table, options,
+                                fields_in, progress_info, exit_event)
+
+    object_buffers = []
+    buffer_total = [0]
+
+    callback = make_object_callback(db, table, task_queue, object_buffers,
+                                    buffer_total, options["fields"], exit_event,
+                                    check_dict=False)
 
     with open_csv_file(filename) as file_in:
-        if PY3:
-            reader = csv.reader(file_in, delimiter=options["delimiter"])
-        else:
-            reader = Utf8CsvReader(file_in, delimiter=options["delimiter"])
+        # Feed the csv module through a generator that counts what has been
+        # read - text-mode files disable tell() while they are being
+        # iterated, and this avoids the syscall anyway.  The count is in
+        # characters on Python 3, which is close enough for a progress report.
+        read_total = [0]
+        def counted_lines():
+            for line in file_in:
+                read_total[0] += len(line)
+                yield line
+        reader = csv.reader(counted_lines(), delimiter=options["delimiter"])
 
         if not options["no_header"]:
-            fields_in = next(reader)
-
-        # Field names may override fields from the header
-        if options["custom_header"] is not None:
-            if not options["no_header"]:
-                print("Ignoring header row: %s" % str(fields_in))
-            fields_in = options["custom_header"]
-        elif options["no_header"]:
-            raise RuntimeError("Error: No field name information available")
+            next(reader) # Header fields were read above
 
         for row in reader:
             file_line = reader.line_num
-            progress_info[0].value = file_line
+            if file_line & 0x3ff == 0:
+                # Only take the shared counter's lock occasionally - Value
+                # writes acquire a semaphore, which doesn't belong on the
+                # per-row path
+                progress_info[0].value = read_total[0]
+            if not PY3:
+                row = decode_csv_row(row)
             if len(fields_in) != len(row):
                 raise RuntimeError("Error: File '%s' line %d has an inconsistent number of columns" % (filename, file_line))
-            # We import all csv fields as strings (since we can't assume the type of the data)
-            obj = dict(zip(fields_in, row))
-            for key in list(obj.keys()): # Treat empty fields as no entry rather than empty string
-                if len(obj[key]) == 0:
-                    del obj[key]
-            object_callback(obj, db, table, task_queue, object_buffers, buffer_sizes, options["fields"], exit_event)
+            # We import all csv fields as strings (since we can't assume the
+            # type of the data), treating empty fields as no entry rather
+            # than empty string
+            callback(dict((key, value) for (key, value) in zip(fields_in, row) if len(value) > 0))
+
+    progress_info[0].value = progress_info[1].value
 
     if len(object_buffers) > 0:
-        task_queue.put((db, table, object_buffers))
+        put_task(task_queue, exit_event, (db, table, "\n".join(object_buffers)))
 
 # This function is called through rdb_call_wrapper, which will reattempt if a connection
 # error occurs.  Progress is not used as this will either succeed or fail.
 def create_table(progress, conn, db, table, pkey):
     if table not in r.db(db).table_list().run(conn):
-        r.db(db).table_create(table, primary_key=pkey).run(conn)
+        try:
+            r.db(db).table_create(table, primary_key=pkey).run(conn)
+        except r.RqlRuntimeError as ex:
+            # Multiple readers on the same table may race here - losing the
+            # race is fine as long as the table exists afterwards
+            if "already exists" not in str(ex):
+                raise
 
-def table_reader(options, file_info, task_queue, error_queue, progress_info, exit_event):
-    try:
-        db = file_info["db"]
-        table = file_info["table"]
-        primary_key = file_info["info"]["primary_key"]
+# Each reader process is given a list of (file_info, progress_info) pairs -
+# small files are grouped onto a shared process to amortize process startup,
+# while large files get a process (or several, for split csv files) to
+# themselves
+def table_reader(options, files, task_queue, error_queue, exit_event, batch_limits):
+    global shared_batch_limits
+    shared_batch_limits = batch_limits
 
+    current_file = None
+    try:
         conn_fn = lambda: r.connect(options["host"], options["port"], auth_key=options["auth_key"])
-        rdb_call_wrapper(conn_fn, "create table", create_table, db, table, primary_key)
-
-        if file_info["format"] == "json":
-            json_reader(task_queue,
-                        file_info["file"],
-                        db, table,
-                        options["fields"],
-                        progress_info,
-                        exit_event)
-        elif file_info["format"] == "csv":
-            csv_reader(task_queue,
-                       file_info["file"],
-                       db, table,
-                       options,
-                       progress_info,
-                       exit_event)
-        else:
-            raise RuntimeError("Error: Unknown file format specified")
+
+        for (file_info, progress_info) in files:
+            current_file = file_info["file"]
+            db = file_info["db"]
+            table = file_info["table"]
+            primary_key = file_info["info"]["primary_key"]
+
+            rdb_call_wrapper(conn_fn, "create table", create_table, db, table, primary_key)
+
+            if file_info["format"] == "json":
+                json_reader(task_queue,
+                            file_info["file"],
+                            db, table,
+                            options["fields"],
+                            progress_info,
+                            exit_event)
+            elif file_info["format"] == "csv":
+                csv_reader(task_queue,
+                           file_info["file"],
+                           db, table,
+                           options,
+                           progress_info,
+                           exit_event,
+                           byte_range=file_info.get("byte_range"))
+            else:
+                raise RuntimeError("Error: Unknown file format specified")
     except InterruptedError:
         pass # Don't save interrupted errors, they are side-effects
     except:
         ex_type, ex_class, tb = sys.exc_info()
-        error_queue.put((ex_type, ex_class, traceback.extract_tb(tb), file_info["file"]))
+        error_queue.put((ex_type, ex_class, traceback.extract_tb(tb), current_file))
 
 def abort_import(signum, frame, parent_pid, exit_event, task_queue, clients, interrupt_event):
     # Only do the abort from the parent process
@@ -556,9 +911,13 @@ def abort_import(signum, frame, parent_pid, exit_event, task_queue, clients, int
 
         alive_clients = sum([client.is_alive() for client in clients])
         for i in xrange(alive_clients):
-            # TODO: this could theoretically block indefinitely if
-            #   the queue is full and clients aren't reading
-            task_queue.put("exit")
+            try:
+                # The queue is bounded and this runs inside the signal
+                # handler, so don't block on it - the parent sends proper
+                # exit markers once the readers have stopped anyway
+                task_queue.put_nowait("exit")
+            except QueueFull:
+                break
 
 def print_progress(ratio):
     total_width = 40
@@ -581,9 +940,80 @@ def update_progress(progress_info):
 
     print_progress(lowest_completion)
 
+csv_min_split_size = 32 * 1024 * 1024
+reader_group_size_limit = 16 * 1024 * 1024
+
+# Group the given files onto reader processes - lists of (file_info,
+# byte_range) per process.  Small files share a process so a directory of
+# many tiny tables doesn't pay process startup per table; csv files big
+# enough to split get one process per byte range.
+def group_reader_files(files_info):
+    groups = []
+    group = []
+    group_size = 0
+    for file_info in files_info:
+        byte_ranges = file_byte_ranges(file_info)
+        if byte_ranges is not None:
+            for byte_range in byte_ranges:
+                range_info = dict(file_info)
+                range_info["byte_range"] = byte_range
+                groups.append([range_info])
+            continue
+        size = os.path.getsize(file_info["file"])
+        if size >= reader_group_size_limit:
+            groups.append([file_info])
+            continue
+        group.append(file_info)
+        group_size += size
+        if group_size >= reader_group_size_limit:
+            groups.append(group)
+            group = []
+            group_size = 0
+    if len(group) > 0:
+        groups.append(group)
+    return groups
+
+# Split a large csv file into byte ranges so several reader processes can
+# parse it in parallel.  Returns None when the file should be read by a
+# single process: small files, Python 2, the pyarrow path (which parallelizes
+# internally), files that use quoting anywhere (a quoted field may span
+# lines, so a mid-file range start cannot be aligned safely), and JSON files
+# (record boundaries cannot be found mid-file without a full scan).
+def file_byte_ranges(file_info):
+    if file_info["format"] != "csv" or not PY3 or pyarrow is not None:
+        return None
+    size = os.path.getsize(file_info["file"])
+    num_ranges = min(8, multiprocessing.cpu_count(), size // csv_min_split_size)
+    if num_ranges < 2:
+        return None
+    with open(file_info["file"], "rb") as file_in:
+        # A sample isn't good enough here - one quoted field with an embedded
+        # newline past the sample would silently misalign a range, so check
+        # the whole file.  A sequential read is still far cheaper than the
+        # parse it enables splitting.
+        while True:
+            chunk = file_in.read(4 * 1024 * 1024)
+            if len(chunk) == 0:
+                break
+            if b"\"" in chunk:
+                return None
+    splits = [size * i // num_ranges for i in xrange(num_ranges + 1)]
+    return [(splits[i], splits[i + 1]) for i in xrange(num_ranges)]
+
+# Block until one of the given processes exits or the timeout elapses.  Uses
+# the event-driven `wait` on process sentinels where available (Python 3),
+# falling back to a plain sleep on Python 2.
+def wait_for_procs(procs, timeout):
+    if wait_for_connections is not None:
+        wait_for_connections([proc.sentinel for proc in procs], timeout=timeout)
+    else:
+        time.sleep(timeout)
+
 def spawn_import_clients(options, files_info):
     # Spawn one reader process for each db.table, as well as many client processes
-    task_queue = SimpleQueue()
+    # The task queue is bounded so readers block once the clients fall behind
+    # instead of buffering the whole file in pipe memory
+    task_queue = multiprocessing.Queue(maxsize=options["clients"] * 2)
     error_queue = SimpleQueue()
     exit_event = multiprocessing.Event()
     interrupt_event = multiprocessing.Event()
@@ -597,6 +1027,8 @@ def spawn_import_clients(options, files_info):
     try:
         progress_info = []
         rows_written = multiprocessing.Value(ctypes.c_longlong, 0)
+        batch_limits = (multiprocessing.Value(ctypes.c_longlong, batch_length_limit),
+                        multiprocessing.Value(ctypes.c_longlong, batch_size_limit))
 
         for i in xrange(options["clients"]):
             client_procs.append(multiprocessing.Process(target=client_process,
@@ -607,24 +1039,29 @@ def spawn_import_clients(options, files_info):
                                                               error_queue,
                                                               rows_written,
                                                               options["force"],
-                                                              options["durability"])))
+                                                              options["durability"],
+                                                              batch_limits)))
             client_procs[-1].start()
 
-        for file_info in files_info:
-            progress_info.append((multiprocessing.Value(ctypes.c_longlong, -1), # Current lines/bytes processed
-                                  multiprocessing.Value(ctypes.c_longlong, 0))) # Total lines/bytes to process
+        for group in group_reader_files(files_info):
+            reader_files = []
+            for file_info in group:
+                progress_info.append((multiprocessing.Value(ctypes.c_longlong, -1), # Current lines/bytes processed
+                                      multiprocessing.Value(ctypes.c_longlong, 0))) # Total lines/bytes to process
+                reader_files.append((file_info, progress_info[-1]))
             reader_procs.append(multiprocessing.Process(target=table_reader,
                                                         args=(options,
-                                                              file_info,
+                                                              reader_files,
                                                               task_queue,
                                                               error_queue,
-                                                              progress_info[-1],
-                                                              exit_event)))
+                                                              exit_event,
+                                                              batch_limits)))
             reader_procs[-1].start()
 
-        # Wait for all reader processes to finish - hooray, polling
+        # Wait for all reader processes to finish, waking up when one exits
+        # or on a short timeout to refresh the progress bar
         while len(reader_procs) > 0:
-            time.sleep(0.1)
+            wait_for_procs(reader_procs, 0.25)
             # If an error has occurred, exit out early
             if not error_queue.empty():
                 exit_event.set()
@@ -632,13 +1069,19 @@ def spawn_import_clients(options, files_info):
             reader_procs = [proc for proc in reader_procs if proc.is_alive()]
             update_progress(progress_info)
 
-        # Wait for all clients to finish
-        alive_clients = sum([client.is_alive() for client in client_procs])
-        for i in xrange(alive_clients):
-            task_queue.put("exit")
+        # Wait for all clients to finish.  The queue is bounded, so put the
+        # exit markers with a timeout and recount the living clients each
+        # attempt - if they have all died there is nothing to signal
+        exit_markers_sent = 0
+        while exit_markers_sent < sum([client.is_alive() for client in client_procs]):
+            try:
+                task_queue.put("exit", timeout=0.1)
+                exit_markers_sent += 1
+            except QueueFull:
+                pass
 
         while len(client_procs) > 0:
-            time.sleep(0.1)
+            wait_for_procs(client_procs, 0.25)
             client_procs = [client for client in client_procs if client.is_alive()]
 
         # If we were successful, make sure 100% progress is reported
@@ -671,98 +1114,206 @@ def spawn_import_clients(options, files_info):
                 print("In file: %s" % error[3], file=sys.stderr)
         raise RuntimeError("Errors occurred during import")
 
-def get_import_info_for_file(filename, db_table_filter):
+# List a directory as (name, is_dir) pairs.  os.scandir reuses the dirent
+# type information and avoids a stat syscall per entry; fall back to
+# listdir+isdir on Python < 3.5.
+def list_directory(path):
+    if hasattr(os, "scandir"):
+        for entry in os.scandir(path):
+            yield entry.name, entry.is_dir()
+    else:
+        for name in os.listdir(path):
+            yield name, os.path.isdir(os.path.join(path, name))
+
+def get_import_info_for_file(filename, db_table_filter, manifest=None, dirpart=None, db=None):
+    # The directory scan already knows each file's directory and db, so only
+    # split the path when called without them - this runs once per file
+    if dirpart is None:
+        dirpart, base = os.path.split(filename)
+    else:
+        base = filename[len(dirpart) + 1:]
+    if db is None:
+        db = os.path.basename(dirpart)
+    table, _, fmt = base.rpartition(".")
+
     file_info = {}
     file_info["file"] = filename
-    file_info["format"] = os.path.split(filename)[1].split(".")[-1]
-    file_info["db"] = os.path.split(os.path.split(filename)[0])[1]
-    file_info["table"] = os.path.split(filename)[1].split(".")[0]
+    file_info["format"] = fmt
+    file_info["db"] = db
+    file_info["table"] = table
 
     if len(db_table_filter) > 0:
         if (file_info["db"], None) not in db_table_filter:
             if (file_info["db"], file_info["table"]) not in db_table_filter:
                 return None
 
-    info_filepath = os.path.join(os.path.split(filename)[0], file_info["table"] + ".info")
-    with open(info_filepath, "r") as info_file:
-        file_info["info"] = json.load(info_file)
+    # A manifest (if the export wrote one) carries the info for every table,
+    # saving one open per file; otherwise read the table's .info sidecar in
+    # binary and decode it with the accelerated parser (if available)
+    if manifest is not None:
+        file_info["info"] = manifest.get(file_info["db"], {}).get(table)
+    if manifest is None or file_info["info"] is None:
+        info_filepath = os.path.join(dirpart, table + ".info")
+        with open(info_filepath, "rb") as info_file:
+            file_info["info"] = row_loads(info_file.read())
 
     return file_info
 
-def tables_check(progress, conn, files_info, force):
+def tables_check(progress, conn, files_info, force, dbs_seen):
     # Ensure that all needed databases exist and tables don't
     db_list = r.db_list().run(conn)
-    for db in set([file_info["db"] for file_info in files_info]):
+    for db in dbs_seen:
         if db == "rethinkdb":
             raise RuntimeError("Error: Cannot import tables into the system database: 'rethinkdb'")
         if db not in db_list:
             r.db_create(db).run(conn)
 
+    # Fetch each db's table list once, rather than once per file
+    tables_by_db = dict((db, set(r.db(db).table_list().run(conn))) for db in dbs_seen)
+
     # Ensure that all tables do not exist (unless --forced)
     already_exist = []
+    extant_tables = []
     for file_info in files_info:
         table = file_info["table"]
         db = file_info["db"]
-        if table in r.db(db).table_list().run(conn):
+        if table in tables_by_db[db]:
             if not force:
                 already_exist.append("%s.%s" % (db, table))
+            extant_tables.append(file_info)
 
-            extant_pkey = r.db(db).table(table).info().run(conn)["primary_key"]
+    # Verify the primary keys of all pre-existing tables in one round trip
+    if len(extant_tables) > 0:
+        extant_pkeys = r.expr([r.db(file_info["db"]).table(file_info["table"]).info()["primary_key"]
+                               for file_info in extant_tables]).run(conn)
+        for file_info, extant_pkey in zip(extant_tables, extant_pkeys):
             if file_info["info"]["primary_key"] != extant_pkey:
-                raise RuntimeError("Error: Table '%s.%s' already exists with a different primary key" % (db, table))
+                raise RuntimeError("Error: Table '%s.%s' already exists with a different primary key" % \
+                                   (file_info["db"], file_info["table"]))
 
     return already_exist
 
 def import_directory(options):
+    # Reuse one connection across the version and tables checks
+    conn_fn = reusable_conn_fn(lambda: r.connect(options["host"], options["port"], auth_key=options["auth_key"]))
+
+    # Kick off the version check on a background thread so its connection
+    # handshake overlaps with the directory scan below
+    version_check = None
+    if ThreadPoolExecutor is not None:
+        version_pool = ThreadPoolExecutor(max_workers=1)
+        version_check = version_pool.submit(rdb_call_wrapper, conn_fn, "version check", check_version)
+
     # Scan for all files, make sure no duplicated tables with different formats
-    dbs = False
     db_filter = set([db_table[0] for db_table in options["db_tables"]])
+    # Frozen once so the per-file membership checks are O(1) rather than
+    # scans of the option list
+    db_tables_filter = frozenset(options["db_tables"])
+    # Catch this before walking the tree - tables_check would reject it anyway,
+    # but only after all the scan and metadata work has been done
+    if "rethinkdb" in db_filter:
+        raise RuntimeError("Error: Cannot import tables into the system database: 'rethinkdb'")
     files_to_import = []
     files_ignored = []
-    for root, dirs, files in os.walk(options["directory"]):
-        if not dbs:
-            files_ignored.extend([os.path.join(root, f) for f in files])
-            # The first iteration through should be the top-level directory, which contains the db folders
-            dbs = True
-            if len(db_filter) > 0:
-                for i in reversed(xrange(len(dirs))):
-                    if dirs[i] not in db_filter:
-                        del dirs[i]
-        else:
-            if len(dirs) != 0:
-                files_ignored.extend([os.path.join(root, d) for d in dirs])
-                del dirs[0:len(dirs)]
-            for f in files:
-                split_file = f.split(".")
-                if len(split_file) != 2 or split_file[1] not in ["json", "csv", "info"]:
-                    files_ignored.append(os.path.join(root, f))
-                elif split_file[1] == "info":
-                    pass # Info files are included based on the data files
-                elif not os.access(os.path.join(root, split_file[0] + ".info"), os.F_OK):
-                    files_ignored.append(os.path.join(root, f))
-                else:
-                    files_to_import.append(os.path.join(root, f))
 
-    # For each table to import collect: file, format, db, table, info
-    files_info = []
-    for filename in files_to_import:
-        res = get_import_info_for_file(filename, options["db_tables"])
-        if res is not None:
-            files_info.append(res)
-
-    # Ensure no two files are for the same db/table, and that all formats are recognized
-    db_tables = set()
-    for file_info in files_info:
-        if (file_info["db"], file_info["table"]) in db_tables:
-            raise RuntimeError("Error: Duplicate db.table found in directory tree: %s.%s" % (file_info["db"], file_info["table"]))
-        if file_info["format"] not in ["csv", "json"]:
-            raise RuntimeError("Error: Unrecognized format for file %s" % file_info["file"])
+    # An export directory is exactly two levels deep - db directories at the
+    # top level with table files inside them - so scan it with two explicit
+    # directory listings rather than a general-purpose os.walk
+    top_dir = options["directory"]
+
+    # A single manifest.json at the top of the export carries the info for
+    # every table, replacing one .info open per data file; older exports
+    # fall back to the per-table sidecar files.  An entry that can't be read
+    # or doesn't parse to the expected {db: {table: info}} shape is not a
+    # manifest - treat it like any other stray file rather than aborting
+    manifest = None
+    manifest_path = os.path.join(top_dir, "manifest.json")
+    if os.access(manifest_path, os.F_OK):
+        try:
+            with open(manifest_path, "rb") as manifest_file:
+                manifest = row_loads(manifest_file.read())
+            if not isinstance(manifest, dict) or \
+               not all(isinstance(tables, dict) for tables in manifest.values()):
+                manifest = None
+        except (ValueError, EnvironmentError):
+            # EnvironmentError covers OSError and IOError on Python 2 -
+            # e.g. an unreadable file or a directory by that name
+            manifest = None
+
+    db_dirs = []
+    remaining_dbs = set(db_filter)
+    for name, is_dir in list_directory(top_dir):
+        if not is_dir:
+            if name != "manifest.json" or manifest is None:
+                files_ignored.append((top_dir, name))
+        elif name == "rethinkdb":
+            # Don't descend into a system db directory
+            files_ignored.append((top_dir, name))
+        elif len(db_filter) == 0 or name in db_filter:
+            db_dirs.append(name)
+            remaining_dbs.discard(name)
+            if len(db_filter) > 0 and len(remaining_dbs) == 0:
+                # Every requested db has been found - stop enumerating
+                break
+
+    db_tables_seen = set()
+    for db in db_dirs:
+        db_path = os.path.join(top_dir, db)
+        # os.path.join is pure Python and runs up to twice per file here, so
+        # build the paths by concatenating a precomputed prefix instead
+        db_prefix = db_path + os.sep
+        manifest_tables = set(manifest.get(db, {})) if manifest is not None else ()
+        # The listing already contains the .info entries, so collect their
+        # names up front rather than issuing an access() syscall per data file
+        entries = list(list_directory(db_path))
+        info_names = set(name[:-5] for name, is_dir in entries
+                         if not is_dir and name.endswith(".info"))
+        for name, is_dir in entries:
+            if is_dir:
+                files_ignored.append((db_path, name))
+                continue
+            split_file = name.split(".")
+            if len(split_file) != 2 or split_file[1] not in ["json", "csv", "info"]:
+                files_ignored.append((db_path, name))
+            elif split_file[1] == "info":
+                pass # Info files are included based on the data files
+            elif split_file[0] not in manifest_tables and split_file[0] not in info_names:
+                files_ignored.append((db_path, name))
+            else:
+                # The extension whitelist above makes a second format check
+                # unnecessary, so only duplicates need to be caught here -
+                # and only among tables the --import filter keeps, since
+                # excluded files are dropped later like they always were
+                table = split_file[0]
+                if len(db_tables_filter) == 0 or (db, None) in db_tables_filter or \
+                   (db, table) in db_tables_filter:
+                    if (db, table) in db_tables_seen:
+                        raise RuntimeError("Error: Duplicate db.table found in directory tree: %s.%s" % (db, table))
+                    db_tables_seen.add((db, table))
+                files_to_import.append((db_prefix + name, db_path, db))
 
-        db_tables.add((file_info["db"], file_info["table"]))
+    # For each table to import collect: file, format, db, table, info
+    # The work per file is opening and parsing a small .info file, so overlap
+    # the syscalls with a thread pool when one is available
+    info_fn = lambda entry: get_import_info_for_file(entry[0], db_tables_filter, manifest, entry[1], entry[2])
+    if ThreadPoolExecutor is not None and len(files_to_import) > 1:
+        pool = ThreadPoolExecutor(max_workers=min(32, len(files_to_import)))
+        try:
+            results = list(pool.map(info_fn, files_to_import))
+        finally:
+            pool.shutdown()
+    else:
+        results = [info_fn(filename) for filename in files_to_import]
+    files_info = [res for res in results if res is not None]
 
-    conn_fn = lambda: r.connect(options["host"], options["port"], auth_key=options["auth_key"])
-    rdb_call_wrapper(conn_fn, "version check", check_version)
-    already_exist = rdb_call_wrapper(conn_fn, "tables check", tables_check, files_info, options["force"])
+    if version_check is not None:
+        version_check.result()
+        version_pool.shutdown()
+    else:
+        rdb_call_wrapper(conn_fn, "version check", check_version)
+    # Computed once here since tables_check may be retried by the wrapper
+    dbs_seen = set(file_info["db"] for file_info in files_info)
+    already_exist = rdb_call_wrapper(conn_fn, "tables check", tables_check, files_info, options["force"], dbs_seen)
 
     if len(already_exist) == 1:
         raise RuntimeError("Error: Table '%s' already exists, run with --force to import into the existing table" % already_exist[0])
@@ -771,13 +1322,14 @@ def import_directory(options):
         extant_tables = "\n  ".join(already_exist)
         raise RuntimeError("Error: The following tables already exist, run with --force to import into the existing tables:\n  %s" % extant_tables)
 
-    # Warn the user about the files that were ignored
+    # Warn the user about the files that were ignored - built as one string
+    # and written in one call rather than a print (and flush) per file
     if len(files_ignored) > 0:
-        print("Unexpected files found in the specified directory.  Importing a directory expects", file=sys.stderr)
-        print(" a directory from `rethinkdb export`.  If you want to import individual tables", file=sys.stderr)
-        print(" import them as single files.  The following files were ignored:", file=sys.stderr)
-        for f in files_ignored:
-            print("%s" % str(f), file=sys.stderr)
+        sys.stderr.write(
+            "Unexpected files found in the specified directory.  Importing a directory expects\n"
+            " a directory from `rethinkdb export`.  If you want to import individual tables\n"
+            " import them as single files.  The following files were ignored:\n" +
+            "\n".join(os.path.join(dirpath, name) for (dirpath, name) in files_ignored) + "\n")
 
     spawn_import_clients(options, files_info)
 
@@ -810,7 +1362,8 @@ def import_file(options):
     pkey = options["primary_key"]
 
     # Ensure that the database and table exist with the right primary key
-    conn_fn = lambda: r.connect(options["host"], options["port"], auth_key=options["auth_key"])
+    # Reuse one connection across the version and table checks
+    conn_fn = reusable_conn_fn(lambda: r.connect(options["host"], options["port"], auth_key=options["auth_key"]))
     rdb_call_wrapper(conn_fn, "version check", check_version)
     pkey = rdb_call_wrapper(conn_fn, "table check", table_check, db, table, pkey, options["force"])
 